@@ -2,7 +2,6 @@ import json
 import os
 import numpy as np
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import re
 import traceback
 
@@ -31,6 +30,9 @@ class RAGChatbot:
         self.questions = [qa['question'] for cat in self.faq_data for qa in cat['questions']]
         self.answers = [qa['answer'] for cat in self.faq_data for qa in cat['questions']]
         self.embeddings = self._load_or_create_embeddings()
+        # Unit rows, so cosine similarity is a single matvec per query
+        inv_norms = 1.0 / np.sqrt(np.einsum('ij,ij->i', self.embeddings, self.embeddings) + 1e-24)
+        self.embeddings_norm = self.embeddings * inv_norms[:, None]
 
     def _load_faq(self):
         with open(self.faq_path, 'r', encoding='utf-8') as f:
@@ -39,7 +41,7 @@ class RAGChatbot:
     def _load_or_create_embeddings(self):
         if os.path.exists(self.cache_path):
             return np.load(self.cache_path)
-        embeddings = self.model.encode(self.questions, show_progress_bar=True)
+        embeddings = self.model.encode(self.questions, show_progress_bar=True, normalize_embeddings=True)
         np.save(self.cache_path, embeddings)
         return embeddings
 
@@ -74,9 +76,9 @@ class RAGChatbot:
                 else:
                     # Generic cutoff question - show guidance
                     return "I can help you with cutoffs! Please specify which type:\n- KCET cutoffs\n- COMEDK cutoffs\n\nYou can also ask about specific branches like 'CSE cutoff' or 'ECE KCET rank'.", 0.0
-            query_emb = self.model.encode([cleaned_query])
-            sims = cosine_similarity(query_emb, self.embeddings)[0]
-            best_idx = np.argmax(sims)
+            query_emb = self.model.encode([cleaned_query])[0]
+            sims = self.embeddings_norm @ (query_emb * (1.0 / np.sqrt(np.vdot(query_emb, query_emb) + 1e-24)))
+            best_idx = int(sims.argmax())
             best_score = sims[best_idx]
             if best_score >= SIMILARITY_THRESHOLD:
                 return self.answers[best_idx], float(best_score)
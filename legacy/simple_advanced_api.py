@@ -3,14 +3,21 @@ Simplified Advanced API for NIE Chatbot
 Uses the simplified advanced chatbot without complex dependencies
 """
 
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, Response, request, jsonify, render_template_string, stream_with_context
 from flask_cors import CORS
 import traceback
 import json
 import time
+import os
+import random
 from datetime import datetime
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import our simplified advanced components
 from simple_advanced_chatbot import get_chatbot
 
@@ -18,9 +25,25 @@ from simple_advanced_chatbot import get_chatbot
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class SamplingFilter(logging.Filter):
+    """Pass warnings and above, sample INFO and below at the given rate"""
+    def __init__(self, rate: float = 0.01):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.INFO or random.random() < self.rate
+
+# Sample per-request INFO logs in production (LOG_SAMPLE=1)
+if os.environ.get('LOG_SAMPLE') == '1':
+    logger.addFilter(SamplingFilter())
+
 app = Flask(__name__)
 CORS(app)
 
+# Payloads larger than this are streamed in chunks of this size
+STREAM_CHUNK_SIZE = 4096
+
 # Global instances
 chatbot = None
 
@@ -32,6 +55,27 @@ def initialize_services():
         chatbot = get_chatbot()
         logger.info("Simple advanced chatbot initialized")
 
+def json_response(data: dict) -> Response:
+    """Serialize once and stream long payloads in chunks"""
+    if orjson is not None:
+        payload = orjson.dumps(data)
+    else:
+        payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    if len(payload) <= STREAM_CHUNK_SIZE:
+        return Response(payload, mimetype='application/json',
+                        headers={'Content-Length': str(len(payload))})
+
+    def generate():
+        for start in range(0, len(payload), STREAM_CHUNK_SIZE):
+            yield payload[start:start + STREAM_CHUNK_SIZE]
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+# Load the model in the gunicorn master (--preload) so forked workers share its weights
+if os.environ.get('PRELOAD_CHATBOT') == '1':
+    initialize_services()
+
 @app.errorhandler(Exception)
 def handle_exception(e):
     """Global exception handler"""
@@ -71,10 +115,10 @@ def chat():
         response_time = time.time() - start_time
         
         # Enhanced logging
-        logger.info(f"User Question: {user_message}")
-        logger.info(f"Selected Answer: {bot_response[:100]}...")
-        logger.info(f"Confidence Score: {confidence:.2f}")
-        logger.info(f"Response Time: {response_time:.2f}s")
+        logger.info("User Question: %s", user_message)
+        logger.info("Selected Answer: %.100s...", bot_response)
+        logger.info("Confidence Score: %.2f", confidence)
+        logger.info("Response Time: %.2fs", response_time)
         
         # Warning for low confidence and fallback usage
         if confidence < 0.7:
@@ -84,7 +128,7 @@ def chat():
                 logger.warning("⚠️ Low confidence, using local fallback")
         
         # Return response with metadata
-        return jsonify({
+        return json_response({
             'response': bot_response,
             'confidence': confidence,
             'response_time': response_time,
@@ -3,7 +3,14 @@ Simplified Advanced RAG Chatbot without complex LangChain dependencies
 Focuses on the core advanced features that work reliably
 """
 
+import os
 import json
+import functools
+
+# One OpenMP/MKL thread per process so gunicorn workers don't oversubscribe cores
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
+
 import numpy as np
 import traceback
 import random
@@ -12,6 +19,12 @@ from typing import List, Dict, Tuple, Optional
 import logging
 
 # Core imports
+import torch
+torch.set_num_threads(1)
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    pass  # only settable before the first parallel op
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 import requests
@@ -22,12 +35,18 @@ import time
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Similarity boundaries between low / medium / high confidence responses
+CONFIDENCE_TIERS = np.array([0.4, 0.7])
+
 class SimpleAdvancedRAGChatbot:
     def __init__(self, faq_file='faq_data.json', embeddings_file='faq_embeddings.npy'):
         """Initialize the simplified advanced RAG chatbot"""
         self.faq_file = faq_file
         self.embeddings_file = embeddings_file
         
+        # Exact-repeat queries skip encode + similarity; templating still varies per call
+        self._match_query = functools.lru_cache(maxsize=4096)(self._match_query_uncached)
+        
         # Load FAQ data
         self.load_faq_data()
         
@@ -57,6 +76,7 @@ class SimpleAdvancedRAGChatbot:
                     self.answers.append(qa['answer'])
                     self.categories.append(category_name)
             
+            self._match_query.cache_clear()
             logger.info(f"Loaded {len(self.questions)} questions from {len(self.faq_data)} categories")
             
         except Exception as e:
@@ -88,6 +108,7 @@ class SimpleAdvancedRAGChatbot:
         try:
             logger.info("Generating embeddings for FAQ questions...")
             self.embeddings = self.embeddings_model.encode(self.questions)
+            self._match_query.cache_clear()
             
             # Save embeddings
             np.save(self.embeddings_file, self.embeddings)
@@ -184,36 +205,41 @@ class SimpleAdvancedRAGChatbot:
                 return "I'd be happy to help with cutoff information! Could you please specify which exam you're interested in - KCET or COMEDK? This will help me provide you with the most accurate and relevant cutoff data.", 0.8
             
             # Perform semantic search
-            query_emb = self.embeddings_model.encode([cleaned_query])
-            similarities = cosine_similarity(query_emb, self.embeddings)[0]
-            best_idx = np.argmax(similarities)
-            best_score = similarities[best_idx]
+            best_idx, best_score = self._match_query(cleaned_query)
             
-            # High confidence - return FAQ answer with variation
-            if best_score >= 0.7:
-                answer = self.answers[best_idx]
-                category = self.categories[best_idx]
-                
-                # Generate varied response
-                varied_answer = self.get_response_variation(answer, category)
-                
-                return varied_answer, float(best_score)
-            
-            # Medium confidence - try fallback
-            elif best_score >= 0.4:
-                fallback_response = self.search_nie_website(cleaned_query)
-                return fallback_response, 0.6
-            
-            # Low confidence - generic fallback
-            else:
-                fallback_response = self.search_nie_website(cleaned_query)
-                return fallback_response, 0.3
+            # Confidence tier: 0=low (<0.4), 1=medium (<0.7), 2=high
+            tier = int(np.searchsorted(CONFIDENCE_TIERS, best_score, side='right'))
+            handler = (self._low_confidence_response,
+                       self._medium_confidence_response,
+                       self._high_confidence_response)[tier]
+            return handler(best_idx, cleaned_query, best_score)
                 
         except Exception as e:
             logger.error(f"Error in get_response: {e}")
             logger.error(traceback.format_exc())
             return "Sorry, I encountered a technical issue while processing your request. Please try again in a moment.", 0.0
 
+    def _match_query_uncached(self, cleaned_query: str) -> Tuple[int, float]:
+        """Find the closest FAQ question for a cleaned query"""
+        query_emb = self.embeddings_model.encode([cleaned_query])
+        similarities = cosine_similarity(query_emb, self.embeddings)[0]
+        best_idx = int(np.argpartition(similarities, -1)[-1])
+        return best_idx, float(similarities[best_idx])
+
+    def _high_confidence_response(self, best_idx: int, cleaned_query: str, best_score: float) -> Tuple[str, float]:
+        """High confidence - return FAQ answer with variation"""
+        answer = self.answers[best_idx]
+        category = self.categories[best_idx]
+        return self.get_response_variation(answer, category), float(best_score)
+
+    def _medium_confidence_response(self, best_idx: int, cleaned_query: str, best_score: float) -> Tuple[str, float]:
+        """Medium confidence - try fallback"""
+        return self.search_nie_website(cleaned_query), 0.6
+
+    def _low_confidence_response(self, best_idx: int, cleaned_query: str, best_score: float) -> Tuple[str, float]:
+        """Low confidence - generic fallback"""
+        return self.search_nie_website(cleaned_query), 0.3
+
     def clean_filler(self, text: str) -> str:
         """Clean filler words from user input"""
         filler_words = ['um', 'uh', 'like', 'you know', 'actually', 'basically', 'literally']
@@ -6,17 +6,34 @@ Initializes all components and provides easy management
 import os
 import sys
 import time
+import signal
 import threading
+import functools
 import subprocess
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.live import Live
-from rich.layout import Layout
 
 console = Console()
 
+# Component entry points are resolved once and reused across (re)starts
+
+@functools.lru_cache(maxsize=None)
+def _chatbot_entry():
+    from advanced_chatbot_rag import initialize_chatbot
+    return initialize_chatbot
+
+@functools.lru_cache(maxsize=None)
+def _monitor_entry():
+    from mlops_monitor import initialize_monitor, get_monitor
+    return initialize_monitor, get_monitor
+
+@functools.lru_cache(maxsize=None)
+def _api_entry():
+    from advanced_api import app, initialize_services
+    return app, initialize_services
+
 class AdvancedChatbotManager:
     def __init__(self):
         self.processes = {}
@@ -25,6 +42,7 @@ class AdvancedChatbotManager:
             'monitor': 'stopped',
             'api': 'stopped'
         }
+        self._shutdown = threading.Event()
         
     def check_dependencies(self):
         """Check if all required dependencies are installed"""
@@ -38,12 +56,12 @@ class AdvancedChatbotManager:
         missing_packages = []
         
         for package in required_packages:
-            try:
-                __import__(package.replace('-', '_'))
-                console.print(f"✅ {package}")
-            except ImportError:
+            # Locate the package without executing its top-level code
+            if importlib.util.find_spec(package.replace('-', '_')) is None:
                 missing_packages.append(package)
                 console.print(f"❌ {package}")
+            else:
+                console.print(f"✅ {package}")
         
         if missing_packages:
             console.print(f"\n⚠️ Missing packages: {', '.join(missing_packages)}")
@@ -58,7 +76,7 @@ class AdvancedChatbotManager:
         try:
             console.print("\n🤖 Initializing Advanced Chatbot...")
             
-            from advanced_chatbot_rag import initialize_chatbot
+            initialize_chatbot = _chatbot_entry()
             chatbot = initialize_chatbot()
             
             console.print("✅ Advanced Chatbot initialized")
@@ -75,7 +93,7 @@ class AdvancedChatbotManager:
         try:
             console.print("\n📊 Starting MLOps Monitor...")
             
-            from mlops_monitor import initialize_monitor
+            initialize_monitor, _ = _monitor_entry()
             monitor = initialize_monitor()
             
             console.print("✅ MLOps Monitor started")
@@ -94,9 +112,15 @@ class AdvancedChatbotManager:
             
             # Start API in a separate thread
             def run_api():
-                from advanced_api import app, initialize_services
+                app, initialize_services = _api_entry()
                 initialize_services()
-                app.run(debug=False, host='0.0.0.0', port=5000)
+                if os.environ.get('DEV_SERVER'):
+                    app.run(debug=False, host='0.0.0.0', port=5000)
+                else:
+                    # Threaded production WSGI server; pool setup happens
+                    # inside the startup wait below
+                    from waitress import serve
+                    serve(app, host='0.0.0.0', port=5000, threads=max(4, os.cpu_count() or 1))
             
             api_thread = threading.Thread(target=run_api, daemon=True)
             api_thread.start()
@@ -119,6 +143,8 @@ class AdvancedChatbotManager:
     
     def display_status(self):
         """Display current system status"""
+        from rich.table import Table
+
         table = Table(title="NIE Advanced Chatbot Status")
         table.add_column("Component", style="cyan")
         table.add_column("Status", style="magenta")
@@ -150,6 +176,8 @@ class AdvancedChatbotManager:
     
     def run_full_system(self):
         """Run the complete advanced chatbot system"""
+        from rich.panel import Panel
+
         console.print(Panel.fit(
             "[bold blue]NIE Advanced Chatbot System[/bold blue]\n"
             "[green]Powered by LangChain & MLOps[/green]\n"
@@ -161,12 +189,17 @@ class AdvancedChatbotManager:
         if not self.check_dependencies():
             return False
         
-        # Initialize components
-        chatbot = self.initialize_chatbot()
+        # Initialize chatbot and monitor concurrently; the API needs both, so
+        # it starts once they are ready
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            chatbot_future = executor.submit(self.initialize_chatbot)
+            monitor_future = executor.submit(self.start_monitor)
+            chatbot = chatbot_future.result()
+            monitor = monitor_future.result()
+        
         if not chatbot:
             return False
         
-        monitor = self.start_monitor()
         if not monitor:
             console.print("⚠️ Continuing without MLOps monitoring...")
         
@@ -194,13 +227,15 @@ class AdvancedChatbotManager:
         console.print("• Visit http://localhost:5000 for the chatbot")
         console.print("• Check analytics at http://localhost:5000/api/analytics")
         
-        try:
-            # Keep the main thread alive
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            console.print("\n\n🛑 Shutting down Advanced Chatbot System...")
-            self.cleanup()
+        # Keep the main thread alive until Ctrl+C; Windows can't interrupt a
+        # blocking wait, so poll there
+        signal.signal(signal.SIGINT, lambda *_: self._shutdown.set())
+        timeout = 1 if os.name == 'nt' else None
+        while not self._shutdown.wait(timeout):
+            pass
+        
+        console.print("\n\n🛑 Shutting down Advanced Chatbot System...")
+        self.cleanup()
     
     def cleanup(self):
         """Cleanup resources"""
@@ -208,7 +243,7 @@ class AdvancedChatbotManager:
         
         if self.status['monitor'] == 'running':
             try:
-                from mlops_monitor import get_monitor
+                _, get_monitor = _monitor_entry()
                 monitor = get_monitor()
                 if monitor:
                     monitor.stop_monitoring()
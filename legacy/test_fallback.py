@@ -3,45 +3,60 @@ Test script for the fallback system
 """
 
 from fallback_system import get_fallback_response, initialize_fallback
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import time
 
+# Concurrent requests allowed against the NIE website
+MAX_CONCURRENT_REQUESTS = 2
+
+async def run_query(loop, pool, sem, query):
+    """Run one fallback query in the thread pool, rate-limited by sem"""
+    async with sem:
+        start_time = time.time()
+        response, confidence = await loop.run_in_executor(pool, get_fallback_response, query)
+        return query, response, confidence, time.time() - start_time
+
+async def run_queries(queries):
+    """Run all queries concurrently, returning results in input order"""
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)  # Be respectful to the server
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+        return await asyncio.gather(*(run_query(loop, pool, sem, q) for q in queries))
+
 def test_fallback_system():
     """Test the fallback system with various queries"""
     print("🧪 Testing NIE Website Fallback System")
     print("=" * 50)
-    
+
     # Initialize fallback
     initialize_fallback()
-    
+
     # Test queries that should trigger fallback
     test_queries = [
         "latest admission criteria 2024",
-        "new courses offered this year", 
+        "new courses offered this year",
         "recent placement statistics",
         "hostel rules and regulations",
         "library timings and facilities",
         "something completely unrelated to NIE"  # Should get generic fallback
     ]
-    
-    for i, query in enumerate(test_queries, 1):
+
+    results = asyncio.run(run_queries(test_queries))
+
+    for i, (query, response, confidence, response_time) in enumerate(results, 1):
         print(f"\n🔍 Test {i}: {query}")
         print("-" * 30)
-        
-        start_time = time.time()
-        response, confidence = get_fallback_response(query)
-        response_time = time.time() - start_time
-        
+
         print(f"⏱️ Response Time: {response_time:.2f}s")
         print(f"🎯 Confidence: {confidence:.2f}")
         print(f"📝 Response: {response[:200]}...")
-        
+
         if confidence >= 0.4:
             print("✅ External fallback successful")
         else:
             print("⚠️ Using generic fallback")
-        
-        time.sleep(1)  # Be respectful to the server
-    
+
     print("\n🎉 Fallback system testing completed!")
 
 if __name__ == "__main__":
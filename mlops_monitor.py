@@ -7,35 +7,108 @@ import os
 import json
 import time
 import logging
+import operator
 import threading
+import queue
+import multiprocessing
+from collections import Counter, deque
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-import pandas as pd
-import numpy as np
-
-# MLOps imports
-import mlflow
-import mlflow.sklearn
-from prometheus_client import Counter, Histogram, Gauge, generate_latest
-import psutil
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.live import Live
-from rich.layout import Layout
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Heavy MLOps dependencies (mlflow, psutil, rich) are imported where they are
+# used so that importing this module stays cheap
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _tail(log: deque, n: int) -> list:
+    """Last n entries of a bounded log, oldest first"""
+    return list(islice(log, max(0, len(log) - n), None))
+
+def _with_iso_timestamps(records: list) -> list:
+    """Copies of log entries with their time.time_ns() timestamp as ISO text"""
+    return [{**r, 'timestamp': datetime.fromtimestamp(r['timestamp'] / 1e9).isoformat()} for r in records]
+
+class InteractionRecord(NamedTuple):
+    """Compact per-interaction record; holds only what analytics reads"""
+    timestamp: int  # time.time_ns()
+    confidence: float
+    response_time: float
+    query_length: int
+    response_length: int
+    query_key: str  # Lowercased first 50 chars, for top queries
+
+# Spawned, not forked: the writer is started lazily from a request thread of a
+# multithreaded server, and forking there can inherit held locks
+_MP = multiprocessing.get_context('spawn')
+
+# MLflow metric name for each queued interaction field
+_MLFLOW_METRICS = ('confidence_score', 'response_time', 'query_length', 'response_length')
+
+def _mlflow_writer(ipc_queue, batch_size: int = 250):
+    """Child-process entrypoint that owns all MLflow I/O
+
+    Receives per-interaction metric tuples on ``ipc_queue`` and writes them in
+    batches under one long-lived run until a ``None`` sentinel arrives.
+    """
+    try:
+        import mlflow
+        from mlflow.entities import Metric
+
+        mlflow.set_tracking_uri("file:./mlruns")
+        experiment_id = mlflow.set_experiment("nie_chatbot_monitoring").experiment_id
+        client = mlflow.tracking.MlflowClient()
+        run_id = client.create_run(experiment_id, run_name="chatbot_interactions").info.run_id
+    except Exception as e:
+        logger.error(f"MLflow setup failed: {e}")
+        return
+    
+    step = 0
+    running = True
+    while running:
+        batch = [ipc_queue.get()]
+        while len(batch) < batch_size:
+            try:
+                batch.append(ipc_queue.get_nowait())
+            except queue.Empty:
+                break
+        if None in batch:
+            running = False
+            batch = batch[:batch.index(None)]
+        
+        metrics = []
+        timestamp_ms = int(time.time() * 1000)
+        for values in batch:
+            for name, value in zip(_MLFLOW_METRICS, values):
+                metrics.append(Metric(name, float(value), timestamp_ms, step))
+            step += 1
+        
+        try:
+            if metrics:
+                # 4 metrics per interaction keeps each batch under MLflow's 1000 limit
+                client.log_batch(run_id, metrics=metrics)
+        except Exception as e:
+            logger.warning(f"Failed to log to MLflow: {e}")
+    
+    client.set_terminated(run_id)
+
 class ChatbotMLOpsMonitor:
     def __init__(self, chatbot_instance=None):
         """Initialize MLOps monitoring system"""
+        from rich.console import Console
+
         self.chatbot = chatbot_instance
         self.console = Console()
         
         # Metrics tracking
-        self.metrics_history = []
+        self.metrics_history = deque(maxlen=1000)
         self.performance_thresholds = {
             'accuracy': 0.85,
             'response_time': 2.0,
@@ -46,69 +119,120 @@ class ChatbotMLOpsMonitor:
         # Auto-retraining settings
         self.auto_retrain_enabled = True
         self.retrain_threshold = 0.1  # Retrain if performance drops by 10%
-        self.last_retrain_time = datetime.now()
+        self.last_retrain_time = datetime.now()  # For display only
         self.retrain_interval = timedelta(hours=24)  # Minimum 24h between retrains
+        self._last_retrain_mono = time.monotonic_ns()
+        self._retrain_interval_ns = int(self.retrain_interval.total_seconds()) * 1_000_000_000
         
         # Data collection
-        self.interaction_log = []
-        self.feedback_log = []
-        
-        # Initialize MLflow
-        self.setup_mlflow()
+        self.interaction_log = deque(maxlen=1000)
+        self.interaction_text_log = deque(maxlen=100)  # Full query/response text, for export
+        self.feedback_log = deque(maxlen=500)
+        
+        # Bumped on every logged interaction/feedback; performance metrics are
+        # recomputed only when it changes
+        self._log_version = 0
+        self._metrics_cache = None
+        self._metrics_cache_version = -1
+        self._dashboard_dirty = threading.Event()
+        
+        # MLflow is set up on the first logged interaction; a child process
+        # owns all MLflow I/O so it never competes with request threads for the GIL
+        self._mlflow_queue = None
+        self._mlflow_process = None
+        self._mlflow_ready = False
+        self._mlflow_lock = threading.Lock()
         
         # Start monitoring thread
         self.monitoring_active = True
+        self._stop_event = threading.Event()
         self.monitor_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
         self.monitor_thread.start()
         
         logger.info("MLOps Monitor initialized")
 
     def setup_mlflow(self):
-        """Setup MLflow tracking"""
+        """Start the MLflow writer process (no-op when MLFLOW_DISABLE is set)"""
+        if os.environ.get('MLFLOW_DISABLE'):
+            logger.info("MLflow tracking disabled via MLFLOW_DISABLE")
+            return
         try:
-            mlflow.set_tracking_uri("file:./mlruns")
-            mlflow.set_experiment("nie_chatbot_monitoring")
+            # Bounded so a dead writer can't grow the queue without limit
+            self._mlflow_queue = _MP.Queue(maxsize=10000)
+            self._mlflow_process = _MP.Process(
+                target=_mlflow_writer, args=(self._mlflow_queue,), daemon=True
+            )
+            self._mlflow_process.start()
             logger.info("MLflow tracking setup completed")
         except Exception as e:
+            self._mlflow_queue = None
+            self._mlflow_process = None
             logger.error(f"MLflow setup failed: {e}")
 
+    def _drop_mlflow_writer(self):
+        """Detach from the writer process and its queue without blocking"""
+        ipc_queue = self._mlflow_queue
+        self._mlflow_queue = None
+        self._mlflow_process = None
+        if ipc_queue is not None:
+            # Nobody reads the queue any more: don't let its feeder thread block exit
+            ipc_queue.cancel_join_thread()
+            ipc_queue.close()
+
     def log_interaction(self, user_query: str, bot_response: str, 
                        confidence: float, response_time: float, 
                        user_id: str = "anonymous"):
         """Log user interaction for analysis"""
-        interaction = {
-            'timestamp': datetime.now().isoformat(),
+        interaction = InteractionRecord(
+            timestamp=time.time_ns(),
+            confidence=confidence,
+            response_time=response_time,
+            query_length=len(user_query),
+            response_length=len(bot_response),
+            query_key=user_query.lower()[:50]
+        )
+        
+        self.interaction_log.append(interaction)
+        self.interaction_text_log.append({
+            'timestamp': interaction.timestamp,
             'user_id': user_id,
             'query': user_query,
             'response': bot_response,
             'confidence': confidence,
             'response_time': response_time,
-            'query_length': len(user_query),
-            'response_length': len(bot_response)
-        }
-        
-        self.interaction_log.append(interaction)
-        
-        # Keep only last 1000 interactions
-        if len(self.interaction_log) > 1000:
-            self.interaction_log = self.interaction_log[-1000:]
-        
-        # Log to MLflow
-        try:
-            with mlflow.start_run():
-                mlflow.log_param("user_query", user_query[:100])  # Truncate for MLflow
-                mlflow.log_metric("confidence_score", confidence)
-                mlflow.log_metric("response_time", response_time)
-                mlflow.log_metric("query_length", len(user_query))
-                mlflow.log_metric("response_length", len(bot_response))
-        except Exception as e:
-            logger.warning(f"Failed to log to MLflow: {e}")
+            'query_length': interaction.query_length,
+            'response_length': interaction.response_length
+        })
+        self._log_version += 1
+        self._dashboard_dirty.set()
+        
+        # Hand off to the MLflow writer process
+        if not self._mlflow_ready:
+            with self._mlflow_lock:
+                if not self._mlflow_ready:
+                    self.setup_mlflow()
+                    self._mlflow_ready = True
+        ipc_queue, process = self._mlflow_queue, self._mlflow_process
+        if ipc_queue is not None:
+            if not process.is_alive():
+                logger.error("MLflow writer process exited; MLflow tracking disabled")
+                with self._mlflow_lock:
+                    if self._mlflow_queue is ipc_queue:
+                        self._drop_mlflow_writer()
+                return
+            try:
+                ipc_queue.put_nowait((interaction.confidence, interaction.response_time,
+                                      interaction.query_length, interaction.response_length))
+            except queue.Full:
+                logger.debug("MLflow queue full, dropping interaction metrics")
+            except ValueError:
+                pass  # queue closed by a concurrent shutdown
 
     def log_feedback(self, user_query: str, bot_response: str, 
                     feedback_score: float, user_id: str = "anonymous"):
         """Log user feedback for model improvement"""
         feedback = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': time.time_ns(),
             'user_id': user_id,
             'query': user_query,
             'response': bot_response,
@@ -116,13 +240,22 @@ class ChatbotMLOpsMonitor:
         }
         
         self.feedback_log.append(feedback)
-        
-        # Keep only last 500 feedback entries
-        if len(self.feedback_log) > 500:
-            self.feedback_log = self.feedback_log[-500:]
+        self._log_version += 1
+        self._dashboard_dirty.set()
 
     def get_performance_metrics(self) -> Dict:
         """Calculate current performance metrics"""
+        if self._metrics_cache_version == self._log_version:
+            return dict(self._metrics_cache)
+        
+        version = self._log_version
+        metrics = self._compute_performance_metrics()
+        self._metrics_cache = metrics
+        self._metrics_cache_version = version
+        return dict(metrics)
+
+    def _compute_performance_metrics(self) -> Dict:
+        """Single pass over recent interactions and feedback"""
         if not self.interaction_log:
             return {
                 'total_interactions': 0,
@@ -132,23 +265,38 @@ class ChatbotMLOpsMonitor:
                 'success_rate': 0
             }
         
-        recent_interactions = self.interaction_log[-100:]  # Last 100 interactions
+        recent_interactions = _tail(self.interaction_log, 100)  # Last 100 interactions
+        
+        sum_confidence = sum_response_time = 0.0
+        sum_query_length = sum_response_length = 0
+        errors = successes = 0
+        for interaction in recent_interactions:
+            confidence = interaction.confidence
+            sum_confidence += confidence
+            sum_response_time += interaction.response_time
+            sum_query_length += interaction.query_length
+            sum_response_length += interaction.response_length
+            if confidence < 0.5:
+                errors += 1
+            if confidence >= 0.7:
+                successes += 1
+        n = len(recent_interactions)
         
         metrics = {
             'total_interactions': len(self.interaction_log),
-            'recent_interactions': len(recent_interactions),
-            'avg_confidence': np.mean([i['confidence'] for i in recent_interactions]),
-            'avg_response_time': np.mean([i['response_time'] for i in recent_interactions]),
-            'error_rate': len([i for i in recent_interactions if i['confidence'] < 0.5]) / len(recent_interactions),
-            'success_rate': len([i for i in recent_interactions if i['confidence'] >= 0.7]) / len(recent_interactions),
-            'avg_query_length': np.mean([i['query_length'] for i in recent_interactions]),
-            'avg_response_length': np.mean([i['response_length'] for i in recent_interactions])
+            'recent_interactions': n,
+            'avg_confidence': sum_confidence / n,
+            'avg_response_time': sum_response_time / n,
+            'error_rate': errors / n,
+            'success_rate': successes / n,
+            'avg_query_length': sum_query_length / n,
+            'avg_response_length': sum_response_length / n
         }
         
         # Add feedback metrics if available
         if self.feedback_log:
-            recent_feedback = self.feedback_log[-50:]
-            metrics['avg_feedback_score'] = np.mean([f['feedback_score'] for f in recent_feedback])
+            recent_feedback = _tail(self.feedback_log, 50)
+            metrics['avg_feedback_score'] = sum(f['feedback_score'] for f in recent_feedback) / len(recent_feedback)
             metrics['feedback_count'] = len(self.feedback_log)
         
         return metrics
@@ -159,7 +307,7 @@ class ChatbotMLOpsMonitor:
             return False
         
         # Check time interval
-        if datetime.now() - self.last_retrain_time < self.retrain_interval:
+        if time.monotonic_ns() - self._last_retrain_mono < self._retrain_interval_ns:
             return False
         
         # Check performance degradation
@@ -184,6 +332,7 @@ class ChatbotMLOpsMonitor:
                 success = self.chatbot.retrain_model()
                 if success:
                     self.last_retrain_time = datetime.now()
+                    self._last_retrain_mono = time.monotonic_ns()
                     logger.info("Model retraining completed successfully")
                     return True
                 else:
@@ -203,12 +352,8 @@ class ChatbotMLOpsMonitor:
         
         # Top queries analysis
         if self.interaction_log:
-            query_counts = {}
-            for interaction in self.interaction_log[-100:]:
-                query = interaction['query'].lower()[:50]  # First 50 chars
-                query_counts[query] = query_counts.get(query, 0) + 1
-            
-            top_queries = sorted(query_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+            query_counts = Counter(i.query_key for i in _tail(self.interaction_log, 100))
+            top_queries = query_counts.most_common(10)
         else:
             top_queries = []
         
@@ -216,7 +361,7 @@ class ChatbotMLOpsMonitor:
         category_stats = {}
         if self.chatbot and hasattr(self.chatbot, 'categories'):
             category_counts = {}
-            for interaction in self.interaction_log[-100:]:
+            for interaction in _tail(self.interaction_log, 100):
                 # This would need to be implemented to map queries to categories
                 pass
         
@@ -230,29 +375,39 @@ class ChatbotMLOpsMonitor:
 
     def _get_feedback_summary(self) -> Dict:
         """Get feedback summary"""
-        if not self.feedback_log:
+        feedback_log = list(self.feedback_log)  # snapshot: log_feedback appends concurrently
+        if not feedback_log:
             return {'total_feedback': 0, 'avg_score': 0}
         
-        scores = [f['feedback_score'] for f in self.feedback_log]
+        total_score = 0
+        positive = 0
+        for feedback in feedback_log:
+            score = feedback['feedback_score']
+            total_score += score
+            if score >= 3:
+                positive += 1
+        total = len(feedback_log)
         return {
-            'total_feedback': len(self.feedback_log),
-            'avg_score': np.mean(scores),
-            'positive_feedback': len([s for s in scores if s >= 3]),
-            'negative_feedback': len([s for s in scores if s < 3])
+            'total_feedback': total,
+            'avg_score': total_score / total,
+            'positive_feedback': positive,
+            'negative_feedback': total - positive
         }
 
+    # (metric, comparison, threshold, recommendation) checked by _get_recommendations
+    _RECOMMENDATION_RULES = (
+        ('avg_confidence', operator.lt, 0.7,
+         "Consider adding more FAQ variations to improve response accuracy"),
+        ('avg_response_time', operator.gt, 2.0,
+         "Response time is high - consider optimizing embeddings or using caching"),
+        ('error_rate', operator.gt, 0.1,
+         "High error rate detected - review failed queries and improve FAQ coverage"),
+    )
+
     def _get_recommendations(self, metrics: Dict) -> List[str]:
         """Generate recommendations based on metrics"""
-        recommendations = []
-        
-        if metrics['avg_confidence'] < 0.7:
-            recommendations.append("Consider adding more FAQ variations to improve response accuracy")
-        
-        if metrics['avg_response_time'] > 2.0:
-            recommendations.append("Response time is high - consider optimizing embeddings or using caching")
-        
-        if metrics['error_rate'] > 0.1:
-            recommendations.append("High error rate detected - review failed queries and improve FAQ coverage")
+        recommendations = [message for key, op, threshold, message in self._RECOMMENDATION_RULES
+                           if op(metrics[key], threshold)]
         
         if not self.feedback_log:
             recommendations.append("Implement user feedback collection to improve model performance")
@@ -261,42 +416,58 @@ class ChatbotMLOpsMonitor:
 
     def _monitoring_loop(self):
         """Background monitoring loop"""
+        import psutil
+
+        proc = psutil.Process()
+        proc.cpu_percent(None)  # Prime the counter; the first call always returns 0.0
+        tick = 0
+        disk_usage = None
+        
         while self.monitoring_active:
             try:
                 # Check for retraining conditions
                 if self.check_retrain_conditions():
                     self.trigger_retrain()
                 
-                # Log system metrics
+                # Log process metrics; disk usage barely moves so sample it every 10th tick
+                if tick % 10 == 0:
+                    disk_usage = psutil.disk_usage('/').percent
+                tick += 1
                 system_metrics = {
-                    'cpu_usage': psutil.cpu_percent(),
-                    'memory_usage': psutil.virtual_memory().percent,
-                    'disk_usage': psutil.disk_usage('/').percent,
-                    'timestamp': datetime.now().isoformat()
+                    'cpu_usage': proc.cpu_percent(None),
+                    'memory_usage': proc.memory_percent(),
+                    'disk_usage': disk_usage,
+                    'timestamp': time.time_ns()
                 }
                 
-                # Store metrics
-                self.metrics_history.append(system_metrics)
+                # Store metrics unless nothing moved since the last sample
+                last = self.metrics_history[-1] if self.metrics_history else None
+                if (last is None
+                        or abs(system_metrics['cpu_usage'] - last['cpu_usage']) >= 1.0
+                        or abs(system_metrics['memory_usage'] - last['memory_usage']) >= 1.0
+                        or system_metrics['disk_usage'] != last['disk_usage']):
+                    self.metrics_history.append(system_metrics)
+                    self._dashboard_dirty.set()
                 
-                # Keep only last 1000 entries
-                if len(self.metrics_history) > 1000:
-                    self.metrics_history = self.metrics_history[-1000:]
-                
-                # Sleep for 5 minutes
-                time.sleep(300)
+                # Sleep for 5 minutes, or until stop_monitoring
+                self._stop_event.wait(300)
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(60)
+                self._stop_event.wait(60)
 
     def display_dashboard(self):
         """Display real-time monitoring dashboard"""
+        from rich.layout import Layout
+        from rich.live import Live
+        from rich.panel import Panel
+
         layout = Layout()
         
         layout.split_column(
             Layout(Panel("NIE Chatbot MLOps Dashboard", style="bold blue"), size=3),
             Layout(name="main"),
-            Layout(Panel("System Status", style="green"), size=3)
+            Layout(Panel("System Status", style="green"), name="status", size=3)
         )
         
         layout["main"].split_row(
@@ -304,45 +475,27 @@ class ChatbotMLOpsMonitor:
             Layout(name="right")
         )
         
+        # Renderables are only rebuilt when the logs or system metrics change;
+        # the loop sleeps until something is logged (or 5s pass)
+        rendered_version = None
+        rendered_system = None
+        
         with Live(layout, refresh_per_second=1) as live:
             while True:
                 try:
-                    # Performance metrics
-                    metrics = self.get_performance_metrics()
-                    
-                    # Performance table
-                    perf_table = Table(title="Performance Metrics")
-                    perf_table.add_column("Metric", style="cyan")
-                    perf_table.add_column("Value", style="magenta")
-                    perf_table.add_column("Status", style="green")
-                    
-                    perf_table.add_row("Total Interactions", str(metrics['total_interactions']), "✓")
-                    perf_table.add_row("Avg Confidence", f"{metrics['avg_confidence']:.2f}", 
-                                     "✓" if metrics['avg_confidence'] > 0.7 else "⚠")
-                    perf_table.add_row("Avg Response Time", f"{metrics['avg_response_time']:.2f}s", 
-                                     "✓" if metrics['avg_response_time'] < 2.0 else "⚠")
-                    perf_table.add_row("Success Rate", f"{metrics['success_rate']:.2%}", 
-                                     "✓" if metrics['success_rate'] > 0.8 else "⚠")
-                    
-                    # Top queries table
-                    analytics = self.get_analytics_report()
-                    queries_table = Table(title="Top Queries")
-                    queries_table.add_column("Query", style="cyan")
-                    queries_table.add_column("Count", style="magenta")
-                    
-                    for query, count in analytics['top_queries'][:5]:
-                        queries_table.add_row(query[:30] + "...", str(count))
-                    
-                    layout["left"].update(Panel(perf_table, title="Performance"))
-                    layout["right"].update(Panel(queries_table, title="Analytics"))
+                    if self._log_version != rendered_version:
+                        rendered_version = self._log_version
+                        layout["left"].update(Panel(self._build_performance_table(), title="Performance"))
+                        layout["right"].update(Panel(self._build_queries_table(), title="Analytics"))
                     
                     # System status
-                    if self.metrics_history:
-                        latest_metrics = self.metrics_history[-1]
-                        status = f"CPU: {latest_metrics['cpu_usage']:.1f}% | Memory: {latest_metrics['memory_usage']:.1f}% | Disk: {latest_metrics['disk_usage']:.1f}%"
-                        layout["System Status"].update(Panel(status, style="green"))
+                    if self.metrics_history and self.metrics_history[-1] is not rendered_system:
+                        rendered_system = self.metrics_history[-1]
+                        status = f"CPU: {rendered_system['cpu_usage']:.1f}% | Memory: {rendered_system['memory_usage']:.1f}% | Disk: {rendered_system['disk_usage']:.1f}%"
+                        layout["status"].update(Panel(status, style="green"))
                     
-                    time.sleep(1)
+                    self._dashboard_dirty.wait(timeout=5)
+                    self._dashboard_dirty.clear()
                     
                 except KeyboardInterrupt:
                     break
@@ -350,6 +503,40 @@ class ChatbotMLOpsMonitor:
                     logger.error(f"Dashboard error: {e}")
                     time.sleep(1)
 
+    def _build_performance_table(self):
+        """Performance metrics table for the dashboard"""
+        from rich.table import Table
+
+        metrics = self.get_performance_metrics()
+        
+        perf_table = Table(title="Performance Metrics")
+        perf_table.add_column("Metric", style="cyan")
+        perf_table.add_column("Value", style="magenta")
+        perf_table.add_column("Status", style="green")
+        
+        perf_table.add_row("Total Interactions", str(metrics['total_interactions']), "✓")
+        perf_table.add_row("Avg Confidence", f"{metrics['avg_confidence']:.2f}", 
+                         "✓" if metrics['avg_confidence'] > 0.7 else "⚠")
+        perf_table.add_row("Avg Response Time", f"{metrics['avg_response_time']:.2f}s", 
+                         "✓" if metrics['avg_response_time'] < 2.0 else "⚠")
+        perf_table.add_row("Success Rate", f"{metrics['success_rate']:.2%}", 
+                         "✓" if metrics['success_rate'] > 0.8 else "⚠")
+        return perf_table
+
+    def _build_queries_table(self):
+        """Top queries table for the dashboard"""
+        from rich.table import Table
+
+        analytics = self.get_analytics_report()
+        
+        queries_table = Table(title="Top Queries")
+        queries_table.add_column("Query", style="cyan")
+        queries_table.add_column("Count", style="magenta")
+        
+        for query, count in analytics['top_queries'][:5]:
+            queries_table.add_row(query[:30] + "...", str(count))
+        return queries_table
+
     def export_analytics(self, filename: str = None) -> str:
         """Export analytics data to JSON file"""
         if filename is None:
@@ -358,13 +545,17 @@ class ChatbotMLOpsMonitor:
         analytics_data = {
             'export_timestamp': datetime.now().isoformat(),
             'analytics_report': self.get_analytics_report(),
-            'interaction_log': self.interaction_log[-100:],  # Last 100 interactions
-            'feedback_log': self.feedback_log[-50:],  # Last 50 feedback entries
-            'system_metrics': self.metrics_history[-50:]  # Last 50 system metrics
+            'interaction_log': _with_iso_timestamps(list(self.interaction_text_log)),  # Last 100 interactions
+            'feedback_log': _with_iso_timestamps(_tail(self.feedback_log, 50)),  # Last 50 feedback entries
+            'system_metrics': _with_iso_timestamps(_tail(self.metrics_history, 50))  # Last 50 system metrics
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(analytics_data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(analytics_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(analytics_data, f, indent=2, ensure_ascii=False)
         
         logger.info(f"Analytics exported to {filename}")
         return filename
@@ -372,8 +563,24 @@ class ChatbotMLOpsMonitor:
     def stop_monitoring(self):
         """Stop the monitoring system"""
         self.monitoring_active = False
+        self._stop_event.set()
         if self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=5)
+        
+        with self._mlflow_lock:
+            process = self._mlflow_process
+            if process is not None:
+                if process.is_alive():
+                    # Sentinel: writer flushes what is queued, closes the run and exits
+                    try:
+                        self._mlflow_queue.put(None, timeout=1)
+                    except queue.Full:
+                        logger.warning("MLflow queue full at shutdown; stopping writer")
+                        process.terminate()
+                    process.join(timeout=5)
+                    if process.is_alive():
+                        process.terminate()
+                self._drop_mlflow_writer()
         logger.info("MLOps monitoring stopped")
 
 
@@ -1,25 +1,237 @@
-from flask import Flask, request, jsonify
+import os
+
+# Cap BLAS pools per process; gunicorn runs several workers side by side
+os.environ.setdefault('OMP_NUM_THREADS', '4')
+os.environ.setdefault('MKL_NUM_THREADS', '4')
+os.environ.setdefault('OPENBLAS_NUM_THREADS', '4')
+
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import json
 import numpy as np
 import random
 import time
-import os
 import logging
+import functools
+import re
+import hashlib
+import sqlite3
+import threading
+import queue
+from concurrent.futures import Future
+from collections import Counter, OrderedDict, deque
 from sentence_transformers import SentenceTransformer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ENCODE_TIMEOUT = float(os.getenv('ENCODE_TIMEOUT', 5))
+# Chat queries are short; a tight cap keeps attention cost and padding small
+MAX_SEQ_LEN = int(os.getenv('MAX_SEQ_LEN', 32))
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Routing keywords -> intent, matched as substrings in one scan. The lookahead finds
+# every (possibly overlapping) occurrence, e.g. 'me' inside 'tell me'.
+INTENT_KEYWORDS = {
+    'cutoff': 'cutoff', 'rank': 'cutoff', 'cut off': 'cut_off',
+    'kcet': 'kcet', 'comedk': 'comedk',
+    'cse': 'branch', 'ece': 'branch', 'eee': 'branch', 'me': 'branch', 'civil': 'branch',
+    'placement': 'placement',
+}
+INTENT_RE = re.compile('(?=(' + '|'.join(map(re.escape, INTENT_KEYWORDS)) + '))')
+EXAM_INTENTS = frozenset({'kcet', 'comedk'})
+CUTOFF_INTENTS = frozenset({'cutoff', 'cut_off'})
+
+# Compact per-turn intent ids kept in session history instead of raw query text
+INTENT_GENERAL, INTENT_CUTOFF, INTENT_PLACEMENT = range(3)
+
+def find_intents(text: str) -> set:
+    return {INTENT_KEYWORDS[m.group(1)] for m in INTENT_RE.finditer(text)}
+
+def intent_id(intents: set) -> int:
+    if intents & CUTOFF_INTENTS:
+        return INTENT_CUTOFF
+    if 'placement' in intents:
+        return INTENT_PLACEMENT
+    return INTENT_GENERAL
+
+PLACEMENT_KEYWORDS = ['which companies visit', 'companies visit', 'recruiters', 'placement statistics', 'highest package', 'average package', 'package']
+PLACEMENT_RE = re.compile('|'.join(map(re.escape, PLACEMENT_KEYWORDS)))
+
 app = Flask(__name__)
 CORS(app)
 
-def cosine_similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
-    if a.ndim == 1:
-        a = a.reshape(1, -1)
-    a_norm = a / (np.linalg.norm(a, axis=1, keepdims=True) + 1e-12)
-    b_norm = b / (np.linalg.norm(b, axis=1, keepdims=True) + 1e-12)
-    return a_norm @ b_norm.T
+# INT8 ONNX Runtime drop-in for SentenceTransformer.encode. ONNX_MODEL_DIR must be
+# exported offline with optimum (ORTModelForFeatureExtraction export=True, then
+# ORTQuantizer with AutoQuantizationConfig.avx512_vnni(is_static=False)) and hold
+# the tokenizer files too.
+class OnnxEncoder:
+    def __init__(self, model_dir: str):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = os.cpu_count() or 1
+        model_path = os.path.join(model_dir, os.getenv('ONNX_MODEL_FILE', 'model_quantized.onnx'))
+        self.session = ort.InferenceSession(model_path, sess_options, providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.max_seq_length = 256
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        tokens = self.tokenizer(list(texts), padding=True, truncation=True,
+                                max_length=self.max_seq_length, return_tensors='np')
+        feeds = {k: v.astype(np.int64) for k, v in tokens.items() if k in self.input_names}
+        hidden = self.session.run(None, feeds)[0]
+        # Mean-pool over real tokens, then L2-normalize (matches all-MiniLM-L6-v2)
+        mask = tokens['attention_mask'][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled.astype(np.float32)
+
+# SQLite-backed query embedding cache (EMB_CACHE_PATH) that survives restarts and is
+# shared by worker processes; vectors are stored as float16 to halve the I/O
+class EmbeddingStore:
+    def __init__(self, path: str, model_name: str, max_seq_length: int):
+        self.path = path
+        self.model_name = model_name
+        self.max_seq_length = max_seq_length
+        self.lock = threading.Lock()
+        self.pid = None
+        self.connection()
+
+    def connection(self) -> sqlite3.Connection:
+        # One connection per process: gunicorn --preload forks after __init__
+        if self.pid != os.getpid():
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS emb (key BLOB PRIMARY KEY, vec BLOB)')
+            self.conn.commit()
+            self.pid = os.getpid()
+        return self.conn
+
+    def _key(self, text: str) -> bytes:
+        # Truncation changes the vector, so the sequence cap is part of the key
+        return hashlib.sha1(f"{self.model_name}\0{self.max_seq_length}\0{text}".encode('utf-8')).digest()
+
+    def get(self, text: str):
+        with self.lock:
+            row = self.connection().execute('SELECT vec FROM emb WHERE key = ?', (self._key(text),)).fetchone()
+        if row is None:
+            return None
+        q = np.frombuffer(row[0], dtype=np.float16).astype(np.float32)
+        return q / (np.linalg.norm(q) + 1e-12)
+
+    def put(self, text: str, q: np.ndarray):
+        with self.lock:
+            conn = self.connection()
+            conn.execute('INSERT OR REPLACE INTO emb (key, vec) VALUES (?, ?)',
+                         (self._key(text), q.astype(np.float16).tobytes()))
+            conn.commit()
+
+# Coalesces concurrent query encodes into one forward pass: request threads submit
+# text and wait on a Future, a single worker drains up to max_batch texts, waiting
+# at most ENCODE_BATCH_WAIT_MS for stragglers
+class EncodeBatcher:
+    def __init__(self, encoder, max_batch: int = 32, wait_ms: float = 10.0):
+        self.encoder = encoder
+        self.max_batch = max_batch
+        self.wait = wait_ms / 1000.0
+        self.queue = queue.Queue()
+        threading.Thread(target=self._worker, name='encode-batcher', daemon=True).start()
+
+    def submit(self, text: str) -> Future:
+        future = Future()
+        self.queue.put((text, future))
+        return future
+
+    def _collect(self) -> list:
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _log_truncation(self, texts: list):
+        tokenizer = getattr(self.encoder, 'tokenizer', None)
+        if tokenizer is None:
+            return
+        max_len = self.encoder.max_seq_length
+        # Only texts that might overflow are tokenized again: every token covers at least
+        # one character, plus [CLS] and [SEP]
+        long_texts = [text for text in texts if len(text) + 2 > max_len]
+        if not long_texts:
+            return
+        for text, ids in zip(long_texts, tokenizer(long_texts)['input_ids']):
+            if len(ids) > max_len:
+                logger.info(f"Query truncated from {len(ids)} to {max_len} tokens: {text[:80]}")
+
+    def _worker(self):
+        while True:
+            batch = self._collect()
+            # Length-sorted so similar-length texts share padding; one internal batch
+            batch.sort(key=lambda item: len(item[0]))
+            texts = [text for text, _ in batch]
+            try:
+                self._log_truncation(texts)
+                vectors = self.encoder.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), vec in zip(batch, vectors):
+                future.set_result(vec)
+
+class Session:
+    __slots__ = ('history', 'last_intent')
+
+    def __init__(self, history_len: int):
+        self.history = deque(maxlen=history_len)
+        self.last_intent = None
+
+    def record(self, intent: int):
+        self.history.append(intent)
+        self.last_intent = intent
+
+# Per-user sessions, bounded both in users (LRU eviction past SESSION_CACHE) and in
+# turns per user
+class SessionStore:
+    def __init__(self, maxsize: int, history_len: int = 8):
+        self.maxsize = maxsize
+        self.history_len = history_len
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id: str) -> Session:
+        with self.lock:
+            session = self.sessions.get(user_id)
+            if session is None:
+                session = self.sessions[user_id] = Session(self.history_len)
+                if len(self.sessions) > self.maxsize:
+                    self.sessions.popitem(last=False)
+            else:
+                self.sessions.move_to_end(user_id)
+            return session
+
+def configure_torch_threads():
+    try:
+        import torch
+    except ImportError:
+        return
+    # Same per-worker cap as the BLAS pools; torch's own setting overrides OMP_NUM_THREADS
+    torch.set_num_threads(int(os.getenv('TORCH_THREADS', os.environ['OMP_NUM_THREADS'])))
+    try:
+        torch.set_num_interop_threads(2)
+    except RuntimeError:
+        pass  # only settable before the first parallel op
+
+def encoder_name() -> str:
+    return os.getenv('ONNX_MODEL_DIR') or os.getenv('SENTENCE_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
 
 class NIEAdvancedChatbot:
     def __init__(self, faq_file='faq_data.json', embeddings_file='faq_embeddings.npy'):
@@ -29,7 +241,18 @@ class NIEAdvancedChatbot:
         self.load_embeddings()
         # Lazy init embedding model to avoid slow/failed cold starts on Railway
         self.embeddings_model = None
-        self.conversation_memory = {}
+        self._batcher = None
+        self._encoder_lock = threading.Lock()
+        # Normalized query vectors for repeated questions (also covers exam_type lookups)
+        self._emb_cache = functools.lru_cache(maxsize=2048)(self._encode_uncached)
+        self._emb_lookups = 0
+        self._emb_store = None
+        if os.getenv('EMB_CACHE_PATH'):
+            try:
+                self._emb_store = EmbeddingStore(os.getenv('EMB_CACHE_PATH'), encoder_name(), MAX_SEQ_LEN)
+            except sqlite3.Error as e:
+                logger.error(f"Embedding cache disabled: {e}")
+        self.conversation_memory = SessionStore(int(os.getenv('SESSION_CACHE', 10000)))
         self.response_templates = {
             "cutoff": [
                 "Based on the latest data, the cutoffs for {} are:\n{}",
@@ -67,27 +290,168 @@ class NIEAdvancedChatbot:
                 self.questions.append(qa['question'])
                 self.answers.append(qa['answer'])
                 self.categories.append(cat_name)
+        self.build_token_index()
+        self.build_intent_sets()
         logger.info(f"Loaded {len(self.questions)} questions from {len(self.faq_data)} categories")
 
+    def build_token_index(self):
+        # Integer-encoded question tokens for the keyword fallback and BM25: one flat
+        # int32 array plus the owning question index and term frequency of each token.
+        self.vocab = {}
+        token_ids = []
+        owners = []
+        tfs = []
+        for i, q in enumerate(self.questions):
+            for tok, tf in Counter(q.lower().split()).items():
+                token_ids.append(self.vocab.setdefault(tok, len(self.vocab)))
+                owners.append(i)
+                tfs.append(tf)
+        self.q_token_ids_flat = np.array(token_ids, dtype=np.int32)
+        self.q_token_owner = np.array(owners, dtype=np.int32)
+        # Per-posting BM25 weight, so a query score is one weighted bincount
+        tf = np.array(tfs, dtype=np.float32)
+        n = len(self.questions)
+        df = np.bincount(self.q_token_ids_flat, minlength=len(self.vocab))
+        idf = np.log((n - df + 0.5) / (df + 0.5) + 1.0).astype(np.float32)
+        doc_len = np.bincount(self.q_token_owner, weights=tf, minlength=n)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / max(doc_len.mean(), 1e-6))
+        self.q_token_bm25 = idf[self.q_token_ids_flat] * tf * (BM25_K1 + 1) / (tf + norm[self.q_token_owner])
+        self.bm25_top_k = int(os.getenv('BM25_TOP_K', 0))
+
+    def build_intent_sets(self):
+        # Routing keyword checks are fixed per FAQ file, so scan the corpus once
+        lowered = [q.lower() for q in self.questions]
+        preferred = frozenset(i for i, q in enumerate(lowered) if PLACEMENT_RE.search(q))
+        avoid = frozenset(i for i, a in enumerate(self.answers) if 'training in technical skills' in a.lower())
+        self._intent_sets = {'placement': (preferred, avoid)}
+        self._cutoff_indices = {
+            exam: [i for i, q in enumerate(lowered) if exam in q and 'cutoff' in q]
+            for exam in ('comedk', 'kcet')
+        }
+
+    def bm25_subset(self, text):
+        # Lexical prefilter: dense scoring only over the top BM25_TOP_K matching
+        # questions; None (full scan) when no query token is in the vocabulary
+        qids = [self.vocab[t] for t in set(text.split()) if t in self.vocab]
+        if not qids:
+            return None
+        hits = np.isin(self.q_token_ids_flat, qids)
+        scores = np.bincount(self.q_token_owner[hits], weights=self.q_token_bm25[hits], minlength=len(self.questions))
+        k = min(self.bm25_top_k, len(scores))
+        top = np.argpartition(scores, -k)[-k:]
+        top = np.sort(top[scores[top] > 0])
+        if len(top) == 0:
+            return None
+        return self.embeddings_norm[top], top
+
+    def keyword_overlap(self, text):
+        tokens = set(text.split())
+        qids = [self.vocab[t] for t in tokens if t in self.vocab]
+        if not qids:
+            return 0, 0.0
+        hits = np.isin(self.q_token_ids_flat, qids)
+        counts = np.bincount(self.q_token_owner[hits], minlength=len(self.questions))
+        best_idx = int(counts.argmax())
+        return best_idx, counts[best_idx] / (len(tokens) + 1e-6)
+
     def load_embeddings(self):
         try:
-            self.embeddings = np.load(self.embeddings_file)
+            # Memory-mapped: pages are read once while normalizing, then the map is dropped
+            embeddings = np.ascontiguousarray(np.load(self.embeddings_file, mmap_mode='r'), dtype=np.float32)
+            inv_norms = 1.0 / np.sqrt(np.einsum('ij,ij->i', embeddings, embeddings) + 1e-24, dtype=np.float32)
+            # Only the normalized matrix is kept. EMBEDDINGS_DTYPE=float16 halves it;
+            # scoring upcasts to float32
+            dtype = np.float16 if os.getenv('EMBEDDINGS_DTYPE') == 'float16' else np.float32
+            self.embeddings_norm = (embeddings * inv_norms[:, None]).astype(dtype, copy=False)
+            self.build_intent_subsets()
+            self.index = self.build_faiss_index() if os.getenv('USE_FAISS') == '1' else None
             logger.info("Loaded precomputed embeddings ✅")
         except FileNotFoundError:
             logger.error("Embeddings not found! Generate them locally first.")
             raise
 
+    def normalize_query(self, query_emb: np.ndarray) -> np.ndarray:
+        q = np.asarray(query_emb, dtype=np.float32).reshape(-1)
+        return q / (np.linalg.norm(q) + 1e-12)
+
+    def _encode_uncached(self, text: str) -> np.ndarray:
+        q = self._emb_store.get(text) if self._emb_store else None
+        if q is None:
+            self.get_encoder()
+            q = self.normalize_query(self._batcher.submit(text).result(timeout=ENCODE_TIMEOUT))
+            if self._emb_store:
+                self._emb_store.put(text, q)
+        q.flags.writeable = False  # shared by every cache hit
+        return q
+
+    def encode_query(self, text: str) -> np.ndarray:
+        q = self._emb_cache(text)
+        self._emb_lookups += 1
+        if self._emb_lookups % 500 == 0:
+            info = self._emb_cache.cache_info()
+            logger.info(f"Query embedding cache: {info.hits} hits, {info.misses} misses, size {info.currsize}")
+        return q
+
+    def score(self, matrix: np.ndarray, q: np.ndarray) -> np.ndarray:
+        return matrix.astype(np.float32, copy=False) @ q
+
+    def build_faiss_index(self):
+        # Exact inner-product index (cosine on unit rows); needs faiss-cpu installed
+        try:
+            import faiss
+        except ImportError:
+            logger.error("USE_FAISS=1 but faiss is not installed; using numpy scan")
+            return None
+        index = faiss.IndexFlatIP(self.embeddings_norm.shape[1])
+        index.add(np.ascontiguousarray(self.embeddings_norm, dtype=np.float32))
+        logger.info(f"FAISS index built with {index.ntotal} vectors")
+        return index
+
+    def search(self, q: np.ndarray):
+        if self.index is not None:
+            scores, ids = self.index.search(np.array(q, dtype=np.float32, ndmin=2), 1)
+            return int(ids[0, 0]), float(scores[0, 0])
+        similarities = self.score(self.embeddings_norm, q)
+        best_idx = int(similarities.argmax())
+        return best_idx, float(similarities[best_idx])
+
+    def build_intent_subsets(self):
+        # Contiguous copies of the fixed routing subsets plus their FAQ indices,
+        # so per-request scoring never fancy-indexes the full matrix
+        preferred, avoid = self._intent_sets['placement']
+        intent_indices = dict(self._cutoff_indices, placement=sorted(preferred - avoid))
+        self._intent_subsets = {
+            key: (np.ascontiguousarray(self.embeddings_norm[indices]), np.array(indices, dtype=np.int32))
+            for key, indices in intent_indices.items() if indices
+        }
+
     def get_encoder(self):
         if self.embeddings_model is None:
-            try:
-                model_name = os.getenv('SENTENCE_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+            # Double-checked: concurrent first requests must load one model and one batcher
+            with self._encoder_lock:
+                if self.embeddings_model is None:
+                    self.embeddings_model = self.load_encoder()
+        return self.embeddings_model
+
+    def load_encoder(self):
+        try:
+            onnx_dir = os.getenv('ONNX_MODEL_DIR')
+            if onnx_dir:
+                encoder = OnnxEncoder(onnx_dir)
+                logger.info(f"ONNX encoder loaded: {onnx_dir}")
+            else:
+                configure_torch_threads()
+                model_name = encoder_name()
                 cache_dir = os.getenv('SENTENCE_CACHE_DIR', None)
-                self.embeddings_model = SentenceTransformer(model_name, cache_folder=cache_dir) if cache_dir else SentenceTransformer(model_name)
+                encoder = SentenceTransformer(model_name, cache_folder=cache_dir) if cache_dir else SentenceTransformer(model_name)
                 logger.info(f"SentenceTransformer model loaded: {model_name}")
-            except Exception as e:
-                logger.error(f"Failed to load embedding model: {e}")
-                self.embeddings_model = False  # sentinel meaning unavailable
-        return self.embeddings_model
+            encoder.max_seq_length = MAX_SEQ_LEN
+            # Batcher first: the encoder is only published once it can be used
+            self._batcher = EncodeBatcher(encoder, wait_ms=float(os.getenv('ENCODE_BATCH_WAIT_MS', 10)))
+            return encoder
+        except Exception as e:
+            logger.error(f"Failed to load embedding model: {e}")
+            return False  # sentinel meaning unavailable
 
     def get_response_variation(self, answer: str) -> str:
         if random.random() > 0.3:
@@ -116,21 +480,21 @@ class NIEAdvancedChatbot:
         else:
             return f"I'm not sure about '{query}'. Check https://nie.ac.in/ or contact the relevant department."
 
-    def get_cutoff_data(self, exam_type: str, user_history: list):
+    def get_cutoff_data(self, exam_type: str, session: Session):
         if 'comedk' in exam_type:
-            comedk_indices = [i for i, q in enumerate(self.questions) if 'comedk' in q.lower() and 'cutoff' in q.lower()]
-            if comedk_indices:
+            subset = self._intent_subsets.get('comedk')
+            if subset is not None:
                 encoder = self.get_encoder()
                 if encoder is False:
                     return "COMEDK cutoffs information is available, but the encoder failed to load on the server. Please retry in a minute.", 0.5
-                query_emb = encoder.encode([exam_type])
-                comedk_embeddings = self.embeddings[comedk_indices]
-                similarities = cosine_similarity(query_emb, comedk_embeddings)[0]
-                best_idx = np.argmax(similarities)
-                best_score = similarities[best_idx]
+                matrix, idx_map = subset
+                q = self.encode_query(exam_type)
+                similarities = self.score(matrix, q)
+                best_idx = int(similarities.argmax())
+                best_score = float(similarities[best_idx])
                 if best_score > 0.5:
-                    answer = self.answers[comedk_indices[best_idx]]
-                    return answer, float(best_score)
+                    answer = self.answers[idx_map[best_idx]]
+                    return answer, best_score
             return """COMEDK cutoffs (last year):
 - CSE (E085): 10182
 - CI (E085): 12789  
@@ -139,19 +503,19 @@ class NIEAdvancedChatbot:
 - ME (E142): 95259
 - Civil (E142): 80212""", 0.8
         elif 'kcet' in exam_type:
-            kcet_indices = [i for i, q in enumerate(self.questions) if 'kcet' in q.lower() and 'cutoff' in q.lower()]
-            if kcet_indices:
+            subset = self._intent_subsets.get('kcet')
+            if subset is not None:
                 encoder = self.get_encoder()
                 if encoder is False:
                     return "KCET cutoffs information is available, but the encoder failed to load on the server. Please retry in a minute.", 0.5
-                query_emb = encoder.encode([exam_type])
-                kcet_embeddings = self.embeddings[kcet_indices]
-                similarities = cosine_similarity(query_emb, kcet_embeddings)[0]
-                best_idx = np.argmax(similarities)
-                best_score = similarities[best_idx]
+                matrix, idx_map = subset
+                q = self.encode_query(exam_type)
+                similarities = self.score(matrix, q)
+                best_idx = int(similarities.argmax())
+                best_score = float(similarities[best_idx])
                 if best_score > 0.5:
-                    answer = self.answers[kcet_indices[best_idx]]
-                    return answer, float(best_score)
+                    answer = self.answers[idx_map[best_idx]]
+                    return answer, best_score
             return """KCET cutoffs (last year):
 - CSE (E178): 8726
 - CI (E178): 11300
@@ -167,67 +531,53 @@ class NIEAdvancedChatbot:
 
     def get_response(self, user_query: str, user_id: str = "default"):
         cleaned_query = user_query.lower().strip()
-        if user_id not in self.conversation_memory:
-            self.conversation_memory[user_id] = []
-        user_history = self.conversation_memory[user_id]
+        session = self.conversation_memory.get(user_id)
 
-        if len(user_history) > 0 and any(word in user_history[-1].lower() for word in ['cutoff', 'cut off', 'ranks', 'rank']):
-            if any(exam in cleaned_query for exam in ['kcet', 'comedk']):
-                return self.get_cutoff_data(cleaned_query, user_history)
+        intents = find_intents(cleaned_query)
+        turn_intent = intent_id(intents)
 
-        generic_cutoff_phrases = ['tell me about cutoffs','tell me about cutoff','tell me about ranks','what are cutoffs','what are cutoff','what are ranks','cutoffs','cutoff','ranks','rank']
-        if any(phrase in cleaned_query for phrase in generic_cutoff_phrases) and not any(specific in cleaned_query for specific in ['kcet','comedk','cse','ece','eee','me','civil']):
-            user_history.append(user_query)
+        if session.last_intent == INTENT_CUTOFF:
+            if intents & EXAM_INTENTS:
+                return self.get_cutoff_data(cleaned_query, session)
+
+        if 'cutoff' in intents and not intents & (EXAM_INTENTS | {'branch'}):
+            session.record(turn_intent)
             return "Please specify which exam - KCET or COMEDK?", 0.8
 
-        candidate_indices = list(range(len(self.questions)))
-        if 'placement' in cleaned_query:
-            preferred_indices = [i for i, q in enumerate(self.questions) if any(k in q.lower() for k in ['which companies visit','companies visit','recruiters','placement statistics','highest package','average package','package'])]
-            avoid_indices = [i for i, a in enumerate(self.answers) if 'training in technical skills' in a.lower()]
-            narrowed = [i for i in preferred_indices if i not in avoid_indices]
-            if narrowed:
-                candidate_indices = narrowed
+        subset = self._intent_subsets.get('placement') if 'placement' in intents else None
 
         encoder = self.get_encoder()
         if encoder is False:
             # Fallback: simple keyword overlap search across questions when encoder unavailable
-            tokens = set(cleaned_query.split())
-            best_idx = 0
-            best_score = 0.0
-            for i, q in enumerate(self.questions):
-                overlap = tokens.intersection(set(q.lower().split()))
-                score = len(overlap) / (len(tokens) + 1e-6)
-                if score > best_score:
-                    best_idx = i
-                    best_score = score
+            best_idx, best_score = self.keyword_overlap(cleaned_query)
             if best_score > 0:
                 answer = self.answers[best_idx]
                 varied_answer = self.get_response_variation(answer)
-                user_history.append(user_query)
+                session.record(turn_intent)
                 return varied_answer, float(min(0.49, best_score))
             fallback_response = self.search_nie_website_fallback(cleaned_query)
-            user_history.append(user_query)
+            session.record(turn_intent)
             return fallback_response, 0.3
-        query_emb = encoder.encode([cleaned_query])
-        if len(candidate_indices) != len(self.questions):
-            subset_embs = self.embeddings[candidate_indices]
-            similarities = cosine_similarity(query_emb, subset_embs)[0]
-            local_best = int(np.argmax(similarities))
-            best_idx = candidate_indices[local_best]
-            best_score = similarities[local_best]
+        q = self.encode_query(cleaned_query)
+        if subset is None and self.bm25_top_k:
+            subset = self.bm25_subset(cleaned_query)
+        if subset is not None:
+            matrix, idx_map = subset
+            similarities = self.score(matrix, q)
+            local_best = int(similarities.argmax())
+            best_idx = int(idx_map[local_best])
+            best_score = float(similarities[local_best])
         else:
-            similarities = cosine_similarity(query_emb, self.embeddings)[0]
-            best_idx = int(np.argmax(similarities))
-            best_score = similarities[best_idx]
+            best_idx, best_score = self.search(q)
 
         if best_score >= 0.2:
             answer = self.answers[best_idx]
             varied_answer = self.get_response_variation(answer)
-            user_history.append(user_query)
-            return varied_answer, float(best_score)
+            session.record(turn_intent)
+            return varied_answer, best_score
         else:
             fallback_response = self.search_nie_website_fallback(cleaned_query)
-            user_history.append(user_query)
+            session.record(turn_intent)
             return fallback_response, 0.3
 
 class FallbackChatbot:
@@ -244,10 +594,20 @@ except Exception as init_err:
     logger.error(f"Chatbot failed to initialize: {init_err}")
     chatbot = FallbackChatbot(str(init_err))
 
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'index.html')
+try:
+    with open(INDEX_PATH, 'rb') as f:
+        INDEX_HTML = f.read()
+except OSError as e:
+    # Keep serving the API; only the landing page is unavailable
+    logger.error(f"index.html could not be loaded: {e}")
+    INDEX_HTML = None
+
 @app.route('/')
 def index():
-    with open('index.html', 'r', encoding='utf-8') as f:
-        return f.read()
+    if INDEX_HTML is None:
+        return jsonify({'error': 'Landing page unavailable.'}), 500
+    return Response(INDEX_HTML, mimetype='text/html')
 
 @app.route('/api/chat', methods=['POST'])
 def chat():